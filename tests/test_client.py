@@ -1,8 +1,12 @@
+import asyncio
 import unittest
 from unittest.mock import ANY
 
 from xibus import DBusError
 from xibus import get_client
+from xibus.connection import InvalidPathError
+from xibus.message import Msg
+from xibus.message import MsgType
 
 
 class TestCall(unittest.IsolatedAsyncioTestCase):
@@ -31,6 +35,20 @@ class TestCall(unittest.IsolatedAsyncioTestCase):
                 )
             self.assertEqual(str(ctx.exception), 'org.freedesktop.DBus.Error.Failed')
 
+    async def test_invalid_path(self):
+        async with get_client('session') as client:
+            for path in ['org/freedesktop/DBus', '/org.freedesktop', '/org\n']:
+                with self.subTest(path=path):
+                    with self.assertRaises(InvalidPathError):
+                        await client.call(
+                            'org.freedesktop.DBus',
+                            path,
+                            'org.freedesktop.DBus',
+                            'ListNames',
+                            (),
+                            '',
+                        )
+
     async def test_proxy_call(self):
         async with get_client('session') as client:
             response = await client.bus.call('ListNames', (), '')
@@ -73,6 +91,67 @@ class TestProperties(unittest.IsolatedAsyncioTestCase):
             response = await client.bus.get_property('Features')
             self.assertIn('ActivatableServicesChanged', response)
 
+    async def test_watch_property_cancel(self):
+        async with get_client('session') as client:
+            w1 = client.bus.watch_property('Features')
+            w2 = client.bus.watch_property('Features')
+            t1 = asyncio.create_task(anext(w1))
+            t2 = asyncio.create_task(anext(w2))
+            await asyncio.sleep(0)
+            t1.cancel()
+            self.assertIn('ActivatableServicesChanged', await t2)
+            with self.assertRaises(asyncio.CancelledError):
+                await t1
+            await w2.aclose()
+            self.assertEqual(client.property_watchers, {})
+
+    async def test_watch_property_error(self):
+        async with get_client('session') as client:
+            w = client.bus.watch_property('Features')
+            await anext(w)
+            (queues,) = client.con.signal_queues.values()
+            for queue in queues:
+                queue.put_nowait(Msg(MsgType.SIGNAL, 0, body=('invalid',)))
+            with self.assertRaises(ValueError):
+                await anext(w)
+            self.assertEqual(client.property_watchers, {})
+
+    async def test_watch_property_after_error(self):
+        async with get_client('session') as client:
+            w1 = client.bus.watch_property('Features')
+            await anext(w1)
+            (queues,) = client.con.signal_queues.values()
+            for queue in queues:
+                queue.put_nowait(Msg(MsgType.SIGNAL, 0, body=('invalid',)))
+            await asyncio.sleep(0)
+
+            # joins before w1 has consumed the error
+            w2 = client.bus.watch_property('Features')
+            self.assertIn('ActivatableServicesChanged', await anext(w2))
+            self.assertEqual(len(client.con.signal_queues), 1)
+
+            with self.assertRaises(ValueError):
+                await anext(w1)
+            self.assertEqual(len(client.property_watchers), 1)
+            await w2.aclose()
+            self.assertEqual(client.property_watchers, {})
+            self.assertEqual(client.con.signal_queues, {})
+
+    async def test_watch_property_shared(self):
+        async with get_client('session') as client:
+            w1 = client.bus.watch_property('Features')
+            w2 = client.bus.watch_property('Features')
+            self.assertIn('ActivatableServicesChanged', await anext(w1))
+            self.assertIn('ActivatableServicesChanged', await anext(w2))
+            self.assertEqual(len(client.property_watchers), 1)
+            self.assertEqual(len(client.con.signal_queues), 1)
+
+            await w1.aclose()
+            self.assertEqual(len(client.property_watchers), 1)
+            await w2.aclose()
+            self.assertEqual(client.property_watchers, {})
+            self.assertEqual(client.con.signal_queues, {})
+
 
 class TestSignals(unittest.IsolatedAsyncioTestCase):
     async def test_subscribe_signal(self):
@@ -1,5 +1,6 @@
 import unittest
 
+from xibus.connection import unmarshal_all
 from xibus.message import Msg
 from xibus.message import MsgFlag
 from xibus.message import MsgType
@@ -403,6 +404,13 @@ class TestMarshal(unittest.TestCase):
                 with self.subTest(i=i, action='marshal'):
                     self.assertEqual(msg.marshal(), data)
 
+    def test_get_size(self):
+        for i, item in enumerate(MESSAGES):
+            with self.subTest(i=i):
+                data = item['data']
+                self.assertEqual(Msg.get_size(data + b'\x00'), len(data))
+                self.assertIsNone(Msg.get_size(data[:15]))
+
     def test_invalid_signature(self):
         for sig in ['a(', 'a{yyy}', 'X']:
             msg = Msg(
@@ -434,3 +442,10 @@ class TestMarshal(unittest.TestCase):
         _, tail, tail_fds = Msg.unmarshal(data, [1])
         self.assertEqual(tail, b'\x00')
         self.assertEqual(tail_fds, [1])
+
+    def test_unmarshal_all(self):
+        data = MESSAGES[0]['data'] + MESSAGES[1]['data']
+        msgs, size, fds = unmarshal_all(memoryview(data + data[:20]), [1])
+        self.assertEqual(msgs, [MESSAGES[0]['message'], MESSAGES[1]['message']])
+        self.assertEqual(size, len(data))
+        self.assertEqual(fds, [1])
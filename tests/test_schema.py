@@ -27,6 +27,9 @@ class TestSchema(unittest.TestCase):
         schema = Schema.from_xml(SCHEMA)
         self.assertEqual(schema.to_xml(), SCHEMA)
 
+    def test_from_xml_cached(self):
+        self.assertIs(Schema.from_xml(SCHEMA), Schema.from_xml(SCHEMA))
+
     def test_construct(self):
         schema = Schema()
         schema.add_method('org.freedesktop.DBus', 'RequestName', ['s', 'u'], ['u'])
@@ -35,3 +38,36 @@ class TestSchema(unittest.TestCase):
         schema.add_signal('org.freedesktop.DBus', 'NameLost', ['s'])
         schema.nodes.append('foo')
         self.assertEqual(schema.to_xml(), SCHEMA)
+
+    def test_find_iface(self):
+        schema = Schema.from_xml(SCHEMA)
+        self.assertEqual(
+            schema.find_iface('methods', 'RequestName'), 'org.freedesktop.DBus'
+        )
+        self.assertEqual(
+            schema.find_iface('signals', 'NameLost'), 'org.freedesktop.DBus'
+        )
+        self.assertIsNone(schema.find_iface('methods', 'NameLost'))
+
+    def test_find_iface_after_add(self):
+        schema = Schema()
+        self.assertIsNone(schema.find_iface('methods', 'Get'))
+        schema.add_defaults()
+        self.assertEqual(
+            schema.find_iface('methods', 'Get'), 'org.freedesktop.DBus.Properties'
+        )
+
+    def test_in_sig(self):
+        schema = Schema.from_xml(SCHEMA)
+        method = schema.interfaces['org.freedesktop.DBus'].methods['RequestName']
+        self.assertEqual(method.in_sig, 'su')
+
+    def test_arg_without_direction(self):
+        schema = Schema.from_xml(
+            '<node><interface name="a.b"><method name="Ping">'
+            '<arg type="s" /></method></interface></node>'
+        )
+        method = schema.interfaces['a.b'].methods['Ping']
+        self.assertEqual(method.args, [(None, 's')])
+        self.assertEqual(method.returns, [])
+        self.assertEqual(method.out_arity, 0)
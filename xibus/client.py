@@ -1,3 +1,4 @@
+import asyncio
 import contextlib
 import enum
 import random
@@ -26,29 +27,15 @@ class SignalQueue:
         self.path = path
         self.iface = iface
         self.signal = signal
-
-    @property
-    def rule(self):
-        return ','.join(
-            f"{key}='{value}'"
-            for key, value in {
-                'type': 'signal',
-                'sender': self.sender,
-                'path': self.path,
-                'interface': self.iface,
-                'member': self.signal,
-            }.items()
+        self.rule = (
+            f"type='signal',sender='{sender}',path='{path}',"
+            f"interface='{iface}',member='{signal}'"
         )
 
     async def __aiter__(self):
+        # the connection only passes matching signals
         async for msg in self.queue:
-            if (
-                msg.sender == self.sender
-                and msg.path == self.path
-                and msg.iface == self.iface
-                and msg.member == self.signal
-            ):
-                yield msg.body
+            yield msg.body
 
 
 class Proxy:
@@ -71,8 +58,11 @@ class Proxy:
         return await self.client.set_property(*self.defaults, prop, value, sig)
 
     async def watch_property(self, prop):
-        async for value in self.client.watch_property(*self.defaults, prop):
-            yield value
+        async with contextlib.aclosing(
+            self.client.watch_property(*self.defaults, prop)
+        ) as values:
+            async for value in values:
+                yield value
 
     async def portal_call(self, method, params=()):
         return await self.client.portal_call(*self.defaults, method, params)
@@ -82,6 +72,7 @@ class Client:
     def __init__(self, con):
         self.con = con
         self.introspect_cache = {}
+        self.property_watchers = {}
         self.bus = Proxy(
             self,
             'org.freedesktop.DBus',
@@ -90,7 +81,7 @@ class Client:
         )
 
     async def introspect(self, name, path):
-        key = f'{name}{path}'
+        key = (name, path)
         if key not in self.introspect_cache:
             iface = 'org.freedesktop.DBus.Introspectable'
             (xml,) = await self.con.call(name, path, iface, 'Introspect', [], '')
@@ -101,12 +92,12 @@ class Client:
         schema = await self.introspect(name, path)
         m = schema.interfaces[iface].methods[method]
         if sig is None:
-            sig = ''.join([v for _, v in m.args])
+            sig = m.in_sig
 
         result = await self.con.call(name, path, iface, method, params, sig)
-        if len(m.returns) == 1:
+        if m.out_arity == 1:
             return result[0]
-        elif len(m.returns) > 1:
+        elif m.out_arity:
             return result
 
     @contextlib.asynccontextmanager
@@ -117,13 +108,13 @@ class Client:
 
         if not name.startswith(':'):
             name = await self.bus.call('GetNameOwner', [name], 's')
-        with self.con.signal_queue() as queue:
+        with self.con.signal_queue(name, path, iface, signal) as queue:
             sq = SignalQueue(queue, name, path, iface, signal)
-            await self.bus.call('AddMatch', [sq.rule], 's')
+            await self.con.add_match(sq.rule)
             try:
                 yield sq
             finally:
-                await self.bus.call('RemoveMatch', [sq.rule], 's')
+                await self.con.remove_match(sq.rule)
 
     @contextlib.asynccontextmanager
     async def acquire_name(self, name):
@@ -148,18 +139,81 @@ class Client:
             sig = schema.interfaces[iface].properties[prop].type
         await self.call(name, path, iprop, 'Set', (iface, prop, (sig, value)), 'ssv')
 
-    async def watch_property(self, name, path, iface, prop):
+    def _fail_properties(self, key, watchers, ready, e):
+        # Pass the error on to the watchers and make sure that new watchers
+        # start a fresh subscription. Only acts once per failed dispatcher.
+        entry = self.property_watchers.get(key)
+        if not entry or entry[0] is not watchers:
+            return
+        del self.property_watchers[key]
+        if not ready.done():
+            ready.set_exception(e)
+        for queues in watchers.values():
+            for q in queues:
+                q.put_nowait(e)
+
+    async def _dispatch_properties(self, key, watchers, ready):
+        # single subscription per (name, path, iface), shared by all
+        # watchers and dispatched by property name
+        name, path, iface = key
         iprop = 'org.freedesktop.DBus.Properties'
-        async with self.subscribe_signal(
-            name, path, iprop, 'PropertiesChanged'
-        ) as queue:
+        try:
+            async with self.subscribe_signal(
+                name, path, iprop, 'PropertiesChanged'
+            ) as queue:
+                ready.set_result(None)
+                try:
+                    async for _iface, changed, invalidated in queue:
+                        if _iface != iface:
+                            continue
+                        for prop, (_sig, value) in changed.items():
+                            for q in watchers.get(prop, ()):
+                                q.put_nowait(value)
+                        for prop in invalidated:
+                            if prop not in changed:
+                                for q in watchers.get(prop, ()):
+                                    q.put_nowait(None)
+                except Exception as e:
+                    # fail before removing the match rule so no new watcher
+                    # joins this dispatcher in the meantime
+                    self._fail_properties(key, watchers, ready, e)
+        except Exception as e:
+            self._fail_properties(key, watchers, ready, e)
+
+    async def watch_property(self, name, path, iface, prop):
+        key = (name, path, iface)
+        if key not in self.property_watchers:
+            watchers = {}
+            ready = self.con.loop.create_future()
+            task = asyncio.create_task(
+                self._dispatch_properties(key, watchers, ready)
+            )
+            self.property_watchers[key] = (watchers, ready, task)
+        entry = self.property_watchers[key]
+        watchers, ready, task = entry
+
+        queue = asyncio.Queue()
+        watchers.setdefault(prop, set()).add(queue)
+        try:
+            # shielded so one cancelled watcher does not affect the others
+            await asyncio.shield(ready)
             yield await self.get_property(name, path, iface, prop)
-            async for _iface, changed, invalidated in queue:
-                if _iface == iface:
-                    if prop in changed:
-                        yield changed[prop][1]
-                    elif prop in invalidated:
-                        yield None
+            while True:
+                value = await queue.get()
+                if isinstance(value, Exception):
+                    raise value
+                yield value
+        finally:
+            watchers[prop].remove(queue)
+            if not watchers[prop]:
+                del watchers[prop]
+            if not watchers:
+                # if the task failed, the entry is already gone or replaced
+                # and the task only needs to finish its cleanup
+                if self.property_watchers.get(key) is entry:
+                    del self.property_watchers[key]
+                    task.cancel()
+                await asyncio.wait([task])
 
     async def portal_call(self, name, path, iface, method, params=()):
         sender = self.con.unique_name.replace('.', '_')[1:]
@@ -195,10 +249,10 @@ class MagicClient(Client):
         if iface:
             return iface
         schema = await self.introspect(name, path)
-        for iface, s in schema.interfaces.items():
-            if value in getattr(s, key):
-                return iface
-        raise ValueError((name, key, value, path))
+        iface = schema.find_iface(key, value)
+        if iface is None:
+            raise ValueError((name, key, value, path))
+        return iface
 
     async def _guess_path(self, name, key, value, path=None, iface=None):
         if path:
@@ -230,5 +284,8 @@ class MagicClient(Client):
 
     async def watch_property(self, name, path, iface, prop):
         path, iface = await self._guess_path(name, 'properties', prop, path, iface)
-        async for value in super().watch_property(name, path, iface, prop):
-            yield value
+        async with contextlib.aclosing(
+            super().watch_property(name, path, iface, prop)
+        ) as values:
+            async for value in values:
+                yield value
@@ -1,14 +1,24 @@
 import asyncio
+import functools
 import os
 import re
 import socket
+import struct
+from collections import deque
 from contextlib import contextmanager
 
+from .marshal import Writer
 from .message import Msg
 from .message import MsgFlag
 from .message import MsgType
 
-RE_PATH = re.compile(r'^/[A-Za-z0-9_/]*$')
+RE_PATH = re.compile(r'/[A-Za-z0-9_/]*')
+ALL_SIGNALS = (None, None, None, None)
+
+
+@functools.lru_cache(maxsize=1024)
+def is_valid_path(path):
+    return RE_PATH.fullmatch(path) is not None
 
 
 class DBusError(Exception):
@@ -28,15 +38,53 @@ async def iter_queue(queue):
             queue.task_done()
 
 
+def unmarshal_all(view, fds):
+    # Messages may be split across reads, so only consume complete ones.
+    # Slicing the memoryview avoids copying the remaining data each time.
+    msgs = []
+    offset = 0
+    while True:
+        size = Msg.get_size(view[offset:])
+        if size is None or offset + size > len(view):
+            return msgs, offset, fds
+        msg, _, fds = Msg.unmarshal(view[offset:offset + size], fds)
+        msgs.append(msg)
+        offset += size
+
+
+class Channel:
+    # lightweight alternative to asyncio.Queue for fanning out signals
+    def __init__(self, maxsize=0):
+        self.maxsize = maxsize
+        self.items = deque()
+        self.event = asyncio.Event()
+
+    def put_nowait(self, item):
+        if 0 < self.maxsize <= len(self.items):
+            raise asyncio.QueueFull
+        self.items.append(item)
+        self.event.set()
+
+    async def __aiter__(self):
+        while True:
+            while self.items:
+                yield self.items.popleft()
+            self.event.clear()
+            await self.event.wait()
+
+
 class Connection:
     def __init__(self, addr, loop=None):
         self.addr = addr
         self.loop = loop
         self.serial = 0
-        self.send_queue = []
+        self.send_queue = deque()
+        self.recv_buf = bytearray()
+        self.recv_fds = []
         self.replies = {}
         self.call_queues = {}
-        self.signal_queues = set()
+        self.signal_queues = {}
+        self.bus_templates = {}
 
         if not self.loop:
             self.loop = asyncio.get_running_loop()
@@ -51,26 +99,38 @@ class Connection:
 
     def on_read(self):
         buf, fds, _, _ = socket.recv_fds(self.sock, 134217728, 255)
-        while buf:
-            msg, buf, fds = Msg.unmarshal(buf, fds)
-            if msg.reply_serial is not None:
-                if msg.reply_serial in self.replies:
-                    future = self.replies.pop(msg.reply_serial)
-                    future.set_result(msg)
-            elif msg.type == MsgType.METHOD_CALL:
-                self.call_queues[msg.destination].put_nowait(msg)
-            elif msg.type == MsgType.SIGNAL:
-                for queue in self.signal_queues:
-                    queue.put_nowait(msg)
-            else:
-                raise ValueError(msg)
+        self.recv_buf += buf
+        self.recv_fds += fds
+
+        with memoryview(self.recv_buf) as view:
+            msgs, size, self.recv_fds = unmarshal_all(view, self.recv_fds)
+        del self.recv_buf[:size]
+
+        for msg in msgs:
+            self.on_msg(msg)
+
+    def on_msg(self, msg):
+        if msg.reply_serial is not None:
+            if msg.reply_serial in self.replies:
+                future = self.replies.pop(msg.reply_serial)
+                future.set_result(msg)
+        elif msg.type == MsgType.METHOD_CALL:
+            self.call_queues[msg.destination].put_nowait(msg)
+        elif msg.type == MsgType.SIGNAL:
+            key = (msg.sender, msg.path, msg.iface, msg.member)
+            for queue in self.signal_queues.get(key, ()):
+                queue.put_nowait(msg)
+            for queue in self.signal_queues.get(ALL_SIGNALS, ()):
+                queue.put_nowait(msg)
+        else:
+            raise ValueError(msg)
 
     def on_write(self):
         if self.send_queue:
-            buf, fds, future = self.send_queue.pop(0)
+            buf, fds, future = self.send_queue.popleft()
             size = socket.send_fds(self.sock, [buf], fds)
             if size < len(buf):
-                self.send_queue.insert(0, (buf[size:], [], future))
+                self.send_queue.appendleft((buf[size:], [], future))
             else:
                 future.set_result(None)
         else:
@@ -80,7 +140,8 @@ class Connection:
         if not self.send_queue:
             self.loop.add_writer(self.sock.fileno(), self.on_write)
         future = self.loop.create_future()
-        self.send_queue.append((buf, fds, future))
+        # slicing a memoryview on partial writes does not copy the data
+        self.send_queue.append((memoryview(buf), fds, future))
         await future
 
     async def recv(self, nbytes):
@@ -125,13 +186,23 @@ class Connection:
         self.sock = None
 
     @contextmanager
-    def signal_queue(self, *, maxsize=32):
-        queue = asyncio.Queue(maxsize)
-        self.signal_queues.add(queue)
+    def signal_queue(
+        self, sender=None, path=None, iface=None, member=None, *, maxsize=32
+    ):
+        # receives either the matching signals or, if all filters are
+        # omitted, all signals
+        key = (sender, path, iface, member)
+        if None in key and key != ALL_SIGNALS:
+            raise ValueError(key)
+        queue = Channel(maxsize)
+        queues = self.signal_queues.setdefault(key, set())
+        queues.add(queue)
         try:
-            yield iter_queue(queue)
+            yield queue
         finally:
-            self.signal_queues.remove(queue)
+            queues.remove(queue)
+            if not queues:
+                del self.signal_queues[key]
 
     @contextmanager
     def call_queue(self, name, *, maxsize=32):
@@ -145,7 +216,7 @@ class Connection:
             self.call_queues.pop(name)
 
     async def call(self, dest, path, iface, method, body, sig, flags=MsgFlag.NONE):
-        if not RE_PATH.match(path):
+        if not is_valid_path(path):
             raise InvalidPathError(path)
 
         request = Msg(
@@ -160,18 +231,22 @@ class Connection:
             flags=flags,
         )
 
+        buf, fds = request.marshal()
+        return await self._call(request.serial, buf, fds, flags)
+
+    async def _call(self, serial, buf, fds, flags=MsgFlag.NONE):
         if flags & MsgFlag.NO_REPLY_EXPECTED:
-            await self.send(*request.marshal())
+            await self.send(buf, fds)
             return
 
         future = self.loop.create_future()
-        self.replies[request.serial] = future
+        self.replies[serial] = future
 
         try:
-            await self.send(*request.marshal())
+            await self.send(buf, fds)
             response = await future
         finally:
-            self.replies.pop(request.serial, None)
+            self.replies.pop(serial, None)
 
         if response.type == MsgType.METHOD_RETURN:
             return response.body
@@ -183,8 +258,42 @@ class Connection:
         else:
             raise ValueError(response.type)
 
+    def _get_bus_template(self, method):
+        # Marshalled header of a call to the bus with a single string
+        # argument. Only body size and serial differ between calls.
+        if method not in self.bus_templates:
+            msg = Msg(
+                MsgType.METHOD_CALL,
+                0,
+                destination='org.freedesktop.DBus',
+                path='/org/freedesktop/DBus',
+                iface='org.freedesktop.DBus',
+                member=method,
+                body=('',),
+                sig='s',
+            )
+            buf, _ = msg.marshal()
+            # strip the body (empty string: size and null byte)
+            self.bus_templates[method] = buf[:-5]
+        return self.bus_templates[method]
+
+    async def _call_bus(self, method, arg):
+        w = Writer('<')
+        w.marshal('s', [arg])
+        serial = self.get_serial()
+        buf = bytearray(self._get_bus_template(method))
+        struct.pack_into('<II', buf, 4, len(w.buf), serial)
+        buf += w.buf
+        return await self._call(serial, buf, [])
+
+    async def add_match(self, rule):
+        await self._call_bus('AddMatch', rule)
+
+    async def remove_match(self, rule):
+        await self._call_bus('RemoveMatch', rule)
+
     async def emit_signal(self, path, iface, signal, body, sig, flags=MsgFlag.NONE):
-        if not RE_PATH.match(path):
+        if not is_valid_path(path):
             raise InvalidPathError(path)
 
         msg = Msg(
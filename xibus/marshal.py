@@ -1,3 +1,4 @@
+import functools
 import struct
 from dataclasses import dataclass
 
@@ -13,6 +14,21 @@ TYPES = {
     'd': 'd',  # float
 }
 
+ALIGN = {
+    **{typ: struct.calcsize(f'={format}') for typ, format in TYPES.items()},
+    'g': 1,
+    'v': 1,
+    's': 4,
+    'o': 4,
+    'h': 4,
+}
+
+STRUCTS = {
+    (endian, typ): struct.Struct(f'{endian}{format}')
+    for endian in '<>'
+    for typ, format in TYPES.items()
+}
+
 
 @dataclass
 class DictItem:
@@ -50,7 +66,9 @@ def _parse_single(sig_iter):
         raise ValueError from e
 
 
+@functools.lru_cache(maxsize=1024)
 def parse_sig(sig):
+    # signatures come from a small recurring set, so cache the results
     sig_iter = iter(sig)
     values = []
     try:
@@ -59,20 +77,17 @@ def parse_sig(sig):
     except ValueError as e:
         raise ValueError(sig) from e
     except StopIteration:
-        return values
+        return tuple(values)
 
 
 def get_align(typ):
-    if isinstance(typ, List):
+    if isinstance(typ, str):
+        if typ in ALIGN:
+            return ALIGN[typ]
+    elif isinstance(typ, List):
         return 4
     elif isinstance(typ, (DictItem, tuple)):
         return 8
-    elif typ in TYPES:
-        return struct.calcsize(f'={TYPES[typ]}')
-    elif typ in ['g', 'v']:
-        return 1
-    elif typ in ['s', 'o', 'h']:
-        return 4
     raise ValueError(typ)
 
 
@@ -86,7 +101,7 @@ class Reader:
     def skip_padding(self, align):
         if not isinstance(align, int):
             align = get_align(align)
-        self.offset += (align - self.offset) % align
+        self.offset += -self.offset % align
 
     def _read_str(self, typ):
         if typ == 'g':
@@ -109,7 +124,7 @@ class Reader:
         return arr
 
     def read(self, typ):
-        self.skip_padding(typ)
+        self.offset += -self.offset % get_align(typ)
         if isinstance(typ, List):
             return self._read_list(typ.value)
         elif isinstance(typ, DictItem):
@@ -117,9 +132,9 @@ class Reader:
         elif isinstance(typ, tuple):
             return tuple([self.read(t) for t in typ])
         elif typ in TYPES:
-            format = f'{self.endian}{TYPES[typ]}'
-            (value,) = struct.unpack_from(format, buffer=self.buf, offset=self.offset)
-            self.offset += struct.calcsize(format)
+            s = STRUCTS[self.endian, typ]
+            (value,) = s.unpack_from(self.buf, self.offset)
+            self.offset += s.size
             return value
         elif typ in ['s', 'o', 'g']:
             return self._read_str(typ)
@@ -148,7 +163,7 @@ class Writer:
     def write_padding(self, align):
         if not isinstance(align, int):
             align = get_align(align)
-        self.buf += b'\0' * ((align - len(self.buf)) % align)
+        self.buf += b'\0' * (-len(self.buf) % align)
 
     def _write_str(self, typ, value):
         b = value.encode('utf-8')
@@ -169,7 +184,7 @@ class Writer:
         self.buf += subwriter.buf
 
     def write(self, typ, value):
-        self.write_padding(typ)
+        self.buf += b'\0' * (-len(self.buf) % get_align(typ))
         if isinstance(typ, List):
             self._write_list(typ.value, value)
         elif isinstance(typ, DictItem):
@@ -180,7 +195,7 @@ class Writer:
             for t, v in zip(typ, value, strict=True):
                 self.write(t, v)
         elif typ in TYPES:
-            self.buf += struct.pack(f'{self.endian}{TYPES[typ]}', value)
+            self.buf += STRUCTS[self.endian, typ].pack(value)
         elif typ in ['s', 'o', 'g']:
             self._write_str(typ, value)
         elif typ == 'h':  # file descriptor
@@ -1,4 +1,7 @@
 import enum
+import functools
+import struct
+import sys
 from dataclasses import dataclass
 
 from .marshal import Reader
@@ -28,12 +31,37 @@ class MsgHeader(enum.IntEnum):
     UNIX_FDS = 9
 
     def get_sig(self):
-        return {
-            self.PATH: 'o',
-            self.REPLY_SERIAL: 'u',
-            self.SIG: 'g',
-            self.UNIX_FDS: 'u',
-        }.get(self, 's')
+        return HEADER_SIGS.get(self, 's')
+
+
+HEADER_SIGS = {
+    MsgHeader.PATH: 'o',
+    MsgHeader.REPLY_SERIAL: 'u',
+    MsgHeader.SIG: 'g',
+    MsgHeader.UNIX_FDS: 'u',
+}
+
+# fixed part of the header after the endianness byte:
+# type, flags, version, body size, serial
+HEADER_START = {
+    endian: struct.Struct(f'{endian}BBBII') for endian in ENDIAN
+}
+
+
+def marshal_header_field(endian, code, sig, value):
+    # Header fields start on 8 byte boundaries, so the marshalled bytes do
+    # not depend on their position.
+    w = Writer(endian)
+    w.marshal('(yv)', [(code, (sig, value))])
+    return w.buf
+
+
+# Names and paths come from a small recurring set, so this avoids encoding
+# them again for every message. Integer fields (e.g. reply serials) are
+# mostly unique and would only evict useful entries.
+marshal_str_header_field = functools.lru_cache(maxsize=1024)(
+    marshal_header_field
+)
 
 
 class MsgType(enum.IntEnum):
@@ -84,26 +112,50 @@ class Msg:
             if value is not None:
                 headers[header.value] = header.get_sig(), value
 
+        fields = b''
+        for code, (sig, value) in headers.items():
+            fields += b'\0' * (-len(fields) % 8)
+            if sig == 'u':
+                fields += marshal_header_field(endian, code, sig, value)
+            else:
+                fields += marshal_str_header_field(endian, code, sig, value)
+
         w = Writer(endian)
-        w.marshal('yyyyuua{yv}', [
+        w.marshal('yyyyuuu', [
             ENDIAN[endian],
             self.type,
             self.flags.value,
             VERSION,
             len(w_body.buf),
             self.serial,
-            headers,
+            len(fields),
         ])
         w.write_padding(8)
+        w.buf += fields
+        w.write_padding(8)
 
         return w.buf + w_body.buf, w_body.fds
 
     @classmethod
-    def unmarshal(cls, buf, fds):
-        r = Reader(buf, fds, ENDIAN_REV[buf[0]])
-        r.offset += 1
+    def get_size(cls, buf):
+        # total size of the first message in buf
+        # or None if the fixed part of the header is not complete yet
+        if len(buf) < 16:
+            return None
+        endian = ENDIAN_REV[buf[0]]
+        body_size, _, headers_size = struct.unpack_from(f'{endian}III', buf, 4)
+        headers_end = 16 + headers_size
+        return headers_end + (-headers_end % 8) + body_size
 
-        type, flags, version, _size, serial, headers = r.unmarshal('yyyuua{yv}')
+    @classmethod
+    def unmarshal(cls, buf, fds):
+        endian = ENDIAN_REV[buf[0]]
+        type, flags, version, _size, serial = HEADER_START[endian].unpack_from(
+            buf, 1
+        )
+        r = Reader(buf, fds, endian)
+        r.offset = 1 + HEADER_START[endian].size
+        (headers,) = r.unmarshal('a{yv}')
         if version != VERSION:
             raise ValueError(version)
 
@@ -116,8 +168,12 @@ class Msg:
                     raise ValueError(header, value)
                 if header is MsgHeader.UNIX_FDS:
                     fds = fds[value[1]:]
+                elif header is MsgHeader.REPLY_SERIAL:
+                    msg.reply_serial = value[1]
                 else:
-                    setattr(msg, header.name.lower(), value[1])
+                    # names and paths recur a lot and are compared against
+                    # and used as dict keys, so intern them
+                    setattr(msg, header.name.lower(), sys.intern(value[1]))
 
         r.skip_padding(8)
         msg.body = r.unmarshal(msg.sig)
@@ -1,36 +1,38 @@
+import functools
 import xml.etree.ElementTree as ET
-from collections import namedtuple
-
-_Property = namedtuple('Property', ['type', 'access'])
-_Method = namedtuple('Method', ['args', 'returns'])
-_Signal = namedtuple('Signal', ['args'])
-_Interface = namedtuple('Interface', ['methods', 'properties', 'signals'])
-
-
-def el(tag, attrs):
-    node = ET.Element(tag)
-    for key, value in attrs.items():
-        if value is not None:
-            node.attrib[key] = value
-    return node
-
-
-def get_all_ordered(node, tag, parse):
-    return [(n.get('name'), parse(n)) for n in node.findall(tag)]
-
-
-def get_all(node, tag, parse):
-    return dict(get_all_ordered(node, tag, parse))
+from dataclasses import dataclass
+from dataclasses import field
+from xml.sax.saxutils import escape
+
+XML_DECLARATION = "<?xml version='1.0' encoding='utf-8'?>"
+ATTR_ENTITIES = {
+    '"': '&quot;',
+    '\n': '&#10;',
+    '\r': '&#13;',
+    '\t': '&#09;',
+}
+
+
+def el(tag, attrs, children=()):
+    # returns a list of lines, children are indented
+    a = ''.join(
+        f' {key}="{escape(value, ATTR_ENTITIES)}"'
+        for key, value in attrs.items()
+        if value is not None
+    )
+    if not children:
+        return [f'<{tag}{a} />']
+    return [
+        f'<{tag}{a}>',
+        *(f'  {line}' for child in children for line in child),
+        f'</{tag}>',
+    ]
 
 
 def normalize_args(args):
     return [(None, arg) if isinstance(arg, str) else arg for arg in args]
 
 
-def parse_arg(node):
-    return node.get('type')
-
-
 def unparse_arg(name, typ, direction=None):
     return el('arg', {
         'name': name,
@@ -39,31 +41,28 @@ def unparse_arg(name, typ, direction=None):
     })
 
 
-class Method(_Method):
-    @classmethod
-    def parse(cls, node):
-        # inout args must be included in both
-        return cls(
-            args=get_all_ordered(node, './/arg[@direction!="out"]', parse_arg),
-            returns=get_all_ordered(node, './/arg[@direction!="in"]', parse_arg),
-        )
+@dataclass(slots=True)
+class Method:
+    args: list
+    returns: list
+    in_sig: str = field(init=False)
+    out_arity: int = field(init=False)
+
+    def __post_init__(self):
+        self.in_sig = ''.join([typ for _, typ in self.args])
+        self.out_arity = len(self.returns)
 
     def unparse(self, name):
-        node = el('method', {'name': name})
-        for _name, typ in self.args:
-            node.append(unparse_arg(_name, typ, 'in'))
-        for _name, typ in self.returns:
-            node.append(unparse_arg(_name, typ, 'out'))
-        return node
+        return el('method', {'name': name}, [
+            *(unparse_arg(_name, typ, 'in') for _name, typ in self.args),
+            *(unparse_arg(_name, typ, 'out') for _name, typ in self.returns),
+        ])
 
 
-class Property(_Property):
-    @classmethod
-    def parse(cls, node):
-        return cls(
-            type=node.get('type'),
-            access=node.get('access'),
-        )
+@dataclass(slots=True)
+class Property:
+    type: str
+    access: str
 
     def unparse(self, name):
         return el('property', {
@@ -73,56 +72,61 @@ class Property(_Property):
         })
 
 
-class Signal(_Signal):
-    @classmethod
-    def parse(cls, node):
-        return cls(
-            args=get_all_ordered(node, 'arg', parse_arg),
-        )
+@dataclass(slots=True)
+class Signal:
+    args: list
 
     def unparse(self, name):
-        node = el('signal', {'name': name})
-        for _name, typ in self.args:
-            node.append(unparse_arg(_name, typ))
-        return node
+        return el('signal', {'name': name}, [
+            unparse_arg(_name, typ) for _name, typ in self.args
+        ])
 
 
-class Interface(_Interface):
-    @classmethod
-    def parse(cls, node):
-        return cls(
-            methods=get_all(node, 'method', Method.parse),
-            properties=get_all(node, 'property', Property.parse),
-            signals=get_all(node, 'signal', Signal.parse),
-        )
+@dataclass(slots=True)
+class Interface:
+    methods: dict
+    properties: dict
+    signals: dict
 
     def unparse(self, name):
-        node = el('interface', {'name': name})
-        for _name, method in self.methods.items():
-            node.append(method.unparse(_name))
-        for _name, prop in self.properties.items():
-            node.append(prop.unparse(_name))
-        for _name, signal in self.signals.items():
-            node.append(signal.unparse(_name))
-        return node
+        return el('interface', {'name': name}, [
+            *(method.unparse(_name) for _name, method in self.methods.items()),
+            *(prop.unparse(_name) for _name, prop in self.properties.items()),
+            *(signal.unparse(_name) for _name, signal in self.signals.items()),
+        ])
 
 
 class Schema:
     def __init__(self, interfaces=None, nodes=None):
         self.interfaces = interfaces or {}
         self.nodes = nodes or []
+        self._index = None
+
+    def find_iface(self, key, value):
+        # first interface that has a member `value` in `key`
+        # ('methods', 'properties', or 'signals')
+        if self._index is None:
+            self._index = {}
+            for iface, data in self.interfaces.items():
+                for k in ['methods', 'properties', 'signals']:
+                    for v in getattr(data, k):
+                        self._index.setdefault((k, v), iface)
+        return self._index.get((key, value))
 
     def add_property(self, iface, prop, typ, access):
+        self._index = None
         iface_data = self.interfaces.setdefault(iface, Interface({}, {}, {}))
         iface_data.properties[prop] = Property(typ, access)
 
     def add_method(self, iface, method, args, returns):
+        self._index = None
         iface_data = self.interfaces.setdefault(iface, Interface({}, {}, {}))
         iface_data.methods[method] = Method(
             normalize_args(args), normalize_args(returns)
         )
 
     def add_signal(self, iface, signal, args):
+        self._index = None
         iface_data = self.interfaces.setdefault(iface, Interface({}, {}, {}))
         iface_data.signals[signal] = Signal(normalize_args(args))
 
@@ -133,18 +137,61 @@ class Schema:
         self.add_method('org.freedesktop.DBus.Properties', 'GetAll', ['s'], ['a{sv}'])
 
     @classmethod
+    @functools.lru_cache(maxsize=512)
     def from_xml(cls, s):
-        tree = ET.fromstring(s)
-        return cls(
-            interfaces=get_all(tree, 'interface', Interface.parse),
-            nodes=[n.get('name') for n in tree.findall('node')],
-        )
+        # NOTE: the result is shared between callers, so it must not be
+        # modified. Use add_*() on a fresh Schema instead.
+        schema = cls()
+        parser = ET.XMLPullParser(events=('start', 'end'))
+        parser.feed(s)
+        parser.close()
+
+        # build the schema in a single pass over the parse events
+        stack = []
+        for event, node in parser.read_events():
+            if event == 'start':
+                stack.append(node.tag)
+                name = node.get('name')
+                path = tuple(stack[1:])
+                if path == ('node',):
+                    schema.nodes.append(name)
+                elif path == ('interface',):
+                    iface = schema.interfaces.setdefault(
+                        name, Interface({}, {}, {})
+                    )
+                elif path == ('interface', 'property'):
+                    iface.properties[name] = Property(
+                        node.get('type'), node.get('access')
+                    )
+                elif path in [('interface', 'method'), ('interface', 'signal')]:
+                    member = name
+                    args = []
+                    returns = []
+                elif path == ('interface', 'method', 'arg'):
+                    arg = (name, node.get('type'))
+                    # missing direction means "in"
+                    # inout args must be included in both
+                    direction = node.get('direction', 'in')
+                    if direction != 'out':
+                        args.append(arg)
+                    if direction != 'in':
+                        returns.append(arg)
+                elif path == ('interface', 'signal', 'arg'):
+                    args.append((name, node.get('type')))
+            else:
+                path = tuple(stack[1:])
+                if path == ('interface', 'method'):
+                    iface.methods[member] = Method(args, returns)
+                elif path == ('interface', 'signal'):
+                    iface.signals[member] = Signal(args)
+                stack.pop()
+                node.clear()
+
+        return schema
 
     def to_xml(self):
-        tree = el('node', {})
-        for _name, iface in self.interfaces.items():
-            tree.append(iface.unparse(_name))
-        for _name in self.nodes:
-            tree.append(el('node', {'name': _name}))
-        ET.indent(tree)
-        return ET.tostring(tree, encoding='unicode', xml_declaration=True)
+        lines = el('node', {}, [
+            *(iface.unparse(_name) for _name, iface in self.interfaces.items()),
+            *(el('node', {'name': _name}) for _name in self.nodes),
+        ])
+        return '\n'.join([XML_DECLARATION, *lines])